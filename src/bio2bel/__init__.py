@@ -41,7 +41,7 @@ Testing
 Bio2BEL is tested with Python3 on Linux using `Travis CI <https://travis-ci.org/bio2bel/bio2bel>`_.
 """
 
-from .downloading import make_df_getter, make_downloader  # noqa: F401
+from .downloading import make_batch_downloader, make_df_getter, make_downloader  # noqa: F401
 from .manager import AbstractManager, get_bio2bel_manager_classes  # noqa: F401
 from .utils import ensure_path, get_data_dir  # noqa: F401
 from .version import get_version  # noqa: F401
@@ -5,25 +5,55 @@
 import json
 import logging
 import os
-from typing import Callable, Optional
-from urllib.request import urlretrieve
+import shutil
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, List, Mapping, Optional, Tuple
+from urllib.parse import urlsplit
+from urllib.request import url2pathname, urlretrieve
 from zipfile import ZipFile
 
 import pandas as pd
+import requests
+import urllib3
 
 logger = logging.getLogger(__name__)
 
 __all__ = [
     'make_downloader',
+    'make_batch_downloader',
     'make_json_getter',
     'make_df_getter',
     'make_zipped_df_getter',
 ]
 
+#: Files larger than this (in bytes) are downloaded as several ranges in parallel if the server supports it
+PARALLEL_DOWNLOAD_THRESHOLD = 16 * 1024 * 1024
+
+#: The number of ranges that a large file is split into
+PARALLEL_DOWNLOAD_RANGES = 8
+
+#: The (connect, read) timeouts in seconds for each request, so a stalled server can't hang a download forever
+TIMEOUT = (10, 60)
+
+#: The buffer size (in bytes) used when copying a response to disk
+_BUFFER_SIZE = 1024 * 1024
+
+#: File extensions of compressed files. If a server sends one of these with a content encoding (e.g., a ``.gz``
+#: file with ``Content-Encoding: gzip``), it's saved as sent instead of decompressed.
+_COMPRESSED_EXTENSIONS = {'.gz', '.bz2', '.xz', '.zip', '.tgz', '.zst', '.br', '.z'}
+
+#: The response headers stored next to a downloaded file to check if it has changed on the server
+_VALIDATOR_HEADERS = ('ETag', 'Last-Modified')
+
 
 def make_downloader(url: str, path: str) -> Callable[[bool], str]:  # noqa: D202
     """Make a function that downloads the data for you, or uses a cached version at the given path.
 
+    When an HTTP(S) server sends an ``ETag`` or ``Last-Modified`` header, it's stored in a JSON file next to
+    the data (``<path>.etag``). Later calls ask the server if the data has changed with a conditional request
+    and only download it again if it has.
+
     :param url: The URL of some data
     :param path: The path of the cached data, or where data is cached if it does not already exist
     :return: A function that downloads the data and returns the path of the data
@@ -34,17 +64,258 @@ def make_downloader(url: str, path: str) -> Callable[[bool], str]:  # noqa: D202
 
         :param force_download: If true, overwrites a previously cached file
         """
-        if os.path.exists(path) and not force_download:
+        if not os.path.exists(path) or force_download:
+            logger.info('downloading %s to %s', url, path)
+            _download(url, path)
+            return path
+
+        validators = _read_validators(path)
+        if validators is None:
             logger.debug('using cached data at %s', path)
+            return path
+
+        try:
+            modified = _download(url, path, validators=validators)
+        except (requests.RequestException, urllib3.exceptions.HTTPError) as e:
+            logger.warning('could not check if %s was modified. using cached data at %s: %s', url, path, e)
         else:
-            logger.info('downloading %s to %s', url, path)
-            urlretrieve(url, path)  # noqa: S310
+            if modified:
+                logger.info('downloaded modified %s to %s', url, path)
+            else:
+                logger.debug('%s was not modified. using cached data at %s', url, path)
 
         return path
 
     return download_data
 
 
+def make_batch_downloader(
+    url_path_pairs: Iterable[Tuple[str, str]],
+    max_concurrency: int = 8,
+) -> Callable[[bool], List[str]]:
+    """Make a function that downloads several files at the same time, or uses cached versions of them.
+
+    Each file is handled like with :func:`make_downloader`, so files that are already cached aren't downloaded again.
+
+    :param url_path_pairs: Pairs of the URL of some data and the path where it's cached
+    :param max_concurrency: The maximum number of files to download at the same time
+    :return: A function that downloads the data and returns the paths of the data, in the same order
+    """
+    download_functions = [
+        make_downloader(url, path)
+        for url, path in url_path_pairs
+    ]
+
+    def download_all(force_download: bool = False) -> List[str]:
+        """Download the data.
+
+        :param force_download: If true, overwrites previously cached files
+        """
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = [
+                executor.submit(download_function, force_download=force_download)
+                for download_function in download_functions
+            ]
+            return [future.result() for future in futures]
+
+    return download_all
+
+
+def _download(url: str, path: str, validators: Optional[Mapping[str, str]] = None) -> bool:
+    """Download the URL to the path.
+
+    HTTP(S) downloads and copies of local files (given as a ``file://`` URL or a path) are written to a
+    temporary file in the same directory that replaces the path once it's complete, so an interrupted
+    download never leaves a partial file that looks like a cached one. Other schemes, like FTP, are
+    downloaded with :func:`urllib.request.urlretrieve`.
+
+    :param validators: The ``ETag`` and/or ``Last-Modified`` headers from the previous download. If given,
+     the data is only downloaded if the server says it's been modified.
+    :return: If the data was downloaded
+    """
+    parts = urlsplit(url)
+    # a single letter scheme is the drive of a Windows path
+    is_local = parts.scheme == 'file' or len(parts.scheme) <= 1
+    if not is_local and parts.scheme not in {'http', 'https'}:
+        urlretrieve(url, path)  # noqa: S310
+        return True
+
+    # unlike tempfile.mkstemp, which always uses mode 0600, this respects the umask like urlretrieve does
+    temporary_path = f'{path}.{uuid.uuid4().hex}.download'
+    try:
+        if is_local:
+            # uses the operating system's zero-copy file copying where available (e.g., sendfile on Linux)
+            shutil.copyfile(url2pathname(parts.path) if parts.scheme == 'file' else url, temporary_path)
+            headers = {}
+        else:
+            decode = os.path.splitext(path)[1].lower() not in _COMPRESSED_EXTENSIONS
+            with requests.Session() as session:
+                headers = _download_http(session, url, temporary_path, validators=validators, decode=decode)
+        if headers is None:
+            return False
+        os.replace(temporary_path, path)
+    finally:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+
+    _write_validators(path, headers)
+    return True
+
+
+def _download_http(
+    session: requests.Session,
+    url: str,
+    path: str,
+    validators: Optional[Mapping[str, str]] = None,
+    decode: bool = True,
+) -> Optional[Mapping[str, str]]:
+    """Download the URL to the path, in parallel ranges if it's large and the server supports it.
+
+    :param decode: If the server used a content encoding, like gzip, should the data be decompressed?
+    :return: The response headers, or None if the validators were given and the data wasn't modified
+    """
+    if validators:
+        return _download_stream(session, url, path, headers=_get_conditional_headers(validators), decode=decode)
+
+    head = session.head(url, allow_redirects=True, timeout=TIMEOUT)
+    size = int(head.headers.get('Content-Length', 0))
+    if (
+        head.ok
+        and head.headers.get('Accept-Ranges') == 'bytes'
+        and 'Content-Encoding' not in head.headers
+        and size > PARALLEL_DOWNLOAD_THRESHOLD
+    ):
+        try:
+            _download_ranges(session, head.url, path, size)
+        except (requests.HTTPError, _PartialContentError) as e:
+            # some servers and proxies advertise range support on HEAD but ignore ranges on GET
+            logger.info('could not download %s in ranges. downloading in one request: %s', url, e)
+        else:
+            return head.headers
+
+    return _download_stream(session, url, path, decode=decode)
+
+
+def _download_stream(
+    session: requests.Session,
+    url: str,
+    path: str,
+    headers: Optional[Mapping[str, str]] = None,
+    decode: bool = True,
+) -> Optional[Mapping[str, str]]:
+    """Stream the URL to the path.
+
+    :param decode: If the server used a content encoding, like gzip, should the data be decompressed?
+    :return: The response headers, or None if the server responded that the data wasn't modified
+    """
+    with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        if response.status_code == 304:
+            return None
+        response.raise_for_status()
+        response.raw.decode_content = decode
+        with open(path, 'wb') as file:
+            shutil.copyfileobj(response.raw, file, length=_BUFFER_SIZE)
+            decoded = decode and 'Content-Encoding' in response.headers
+            if not decoded and 'Content-Length' in response.headers:
+                _check_length(file.tell(), int(response.headers['Content-Length']))
+        return response.headers
+
+
+def _check_length(received: int, expected: int) -> None:
+    """Raise an error if the connection closed before all of a response's body was received.
+
+    Older versions of :mod:`urllib3` don't check this themselves.
+    """
+    if received < expected:
+        raise urllib3.exceptions.IncompleteRead(received, expected - received)
+
+
+def _download_ranges(session: requests.Session, url: str, path: str, size: int) -> None:
+    """Download the URL to the path with several simultaneous range requests."""
+    with open(path, 'wb') as file:
+        file.truncate(size)
+
+    range_size = -(-size // PARALLEL_DOWNLOAD_RANGES)  # ceiling division
+    ranges = [
+        (start, min(start + range_size, size) - 1)
+        for start in range(0, size, range_size)
+    ]
+    logger.debug('downloading %s in %d ranges', url, len(ranges))
+    with ThreadPoolExecutor(max_workers=len(ranges)) as executor:
+        futures = [
+            executor.submit(_download_range, session, url, path, start, end)
+            for start, end in ranges
+        ]
+        for future in futures:
+            future.result()
+
+
+class _PartialContentError(ValueError):
+    """Raised when a server doesn't answer a range request with a partial response."""
+
+
+def _download_range(session: requests.Session, url: str, path: str, start: int, end: int) -> None:
+    """Download the given (inclusive) byte range of the URL into the same position of the path."""
+    headers = {'Range': f'bytes={start}-{end}', 'Accept-Encoding': 'identity'}
+    with session.get(url, headers=headers, stream=True, timeout=TIMEOUT) as response:
+        response.raise_for_status()
+        if response.status_code != 206:
+            raise _PartialContentError(f'server did not return a partial response for {url}')
+        with open(path, 'r+b') as file:
+            file.seek(start)
+            shutil.copyfileobj(response.raw, file, length=_BUFFER_SIZE)
+            _check_length(file.tell() - start, end - start + 1)
+
+
+def _get_validators_path(path: str) -> str:
+    return f'{path}.etag'
+
+
+def _read_validators(path: str) -> Optional[Mapping[str, str]]:
+    """Read the validators stored for the given path, if there are any."""
+    validators_path = _get_validators_path(path)
+    if not os.path.exists(validators_path):
+        return None
+    try:
+        with open(validators_path) as file:
+            return json.load(file)
+    except ValueError as e:
+        logger.warning('could not read the validators in %s. using cached data at %s: %s', validators_path, path, e)
+        return None
+
+
+def _write_validators(path: str, headers: Mapping[str, str]) -> None:
+    """Store the validators from the response headers for the given path, or remove stale ones."""
+    validators = {
+        header: headers[header]
+        for header in _VALIDATOR_HEADERS
+        if header in headers
+    }
+    validators_path = _get_validators_path(path)
+    if validators:
+        # written to a temporary file first so an interrupted write can't leave invalid JSON behind
+        temporary_path = f'{validators_path}.{uuid.uuid4().hex}.download'
+        try:
+            with open(temporary_path, 'w') as file:
+                json.dump(validators, file)
+            os.replace(temporary_path, validators_path)
+        finally:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+    elif os.path.exists(validators_path):
+        os.remove(validators_path)
+
+
+def _get_conditional_headers(validators: Mapping[str, str]) -> Mapping[str, str]:
+    """Get the headers for a conditional request from the validators of a previous response."""
+    headers = {}
+    if 'ETag' in validators:
+        headers['If-None-Match'] = validators['ETag']
+    if 'Last-Modified' in validators:
+        headers['If-Modified-Since'] = validators['Last-Modified']
+    return headers
+
+
 def make_json_getter(data_url: str, data_path: str):
     """Build a function that handles downloading JSON data and parsing it.
 
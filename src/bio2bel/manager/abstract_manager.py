@@ -5,13 +5,16 @@
 import logging
 import os
 import sys
+import weakref
 from abc import ABCMeta, abstractmethod
 from functools import wraps
-from typing import List, Mapping, Type
+from typing import Iterable, List, Mapping, Type
 
 import click
 from pyobo.cli_utils import verbose_option
+from sqlalchemy import func, inspect, literal
 from sqlalchemy.ext.declarative.api import DeclarativeMeta
+from sqlalchemy.sql import Select
 
 from .cli_manager import CliMixin
 from .connection_manager import ConnectionManager
@@ -24,33 +27,11 @@ __all__ = [
 
 log = logging.getLogger(__name__)
 
+#: ``SELECT count(*)`` statements for each model, built once and shared by all managers
+_COUNT_STATEMENTS: 'weakref.WeakKeyDictionary[DeclarativeMeta, Select]' = weakref.WeakKeyDictionary()
 
-class AbstractManagerMeta(ABCMeta):
-    """Crazy metaclass to hack in a decorator to the populate function."""
 
-    def __new__(mcs, name, bases, namespace, **kwargs):  # noqa: N804
-        cls = super().__new__(mcs, name, bases, namespace, **kwargs)
-
-        cls._populate_original = cls.populate
-
-        @wraps(cls._populate_original)
-        def populate_wrapped(self, *populate_args, **populate_kwargs):
-            """Populate the database."""
-            try:
-                cls._populate_original(self, *populate_args, **populate_kwargs)
-            except Exception:
-                self._store_populate_failed()
-                raise
-            else:
-                # Hack in the action storage
-                self._store_populate()
-
-        cls.populate = populate_wrapped
-
-        return cls
-
-
-class AbstractManager(ConnectionManager, CliMixin, metaclass=AbstractManagerMeta):
+class AbstractManager(ConnectionManager, CliMixin, metaclass=ABCMeta):
     """This is a base class for implementing your own Bio2BEL manager.
 
     It already includes functions to handle configuration, construction of a connection to a database using SQLAlchemy,
@@ -208,6 +189,28 @@ class AbstractManager(ConnectionManager, CliMixin, metaclass=AbstractManagerMeta
         Note that this property could effectively also be a static method.
         """
 
+    def __init_subclass__(cls, **kwargs):
+        """Wrap the subclass's populate function, unless it's already wrapped, so its outcome gets stored as an action."""
+        super().__init_subclass__(**kwargs)
+
+        populate = cls.populate
+        if getattr(populate, '_bio2bel_wrapped', False):
+            return
+
+        @wraps(populate)
+        def populate_wrapped(self, *populate_args, **populate_kwargs):
+            """Populate the database."""
+            try:
+                populate(self, *populate_args, **populate_kwargs)
+            except Exception:
+                self._store_populate_failed()
+                raise
+            else:
+                self._store_populate()
+
+        populate_wrapped._bio2bel_wrapped = True
+        cls.populate = populate_wrapped
+
     def __init__(self, *args, **kwargs):  # noqa: D107
         super().__init__(*args, **kwargs)
         self.create_all()
@@ -259,7 +262,34 @@ class AbstractManager(ConnectionManager, CliMixin, metaclass=AbstractManagerMeta
 
         :param model: A SQLAlchemy model class
         """
-        return self._get_query(model).count()
+        statement = _COUNT_STATEMENTS.get(model)
+        if statement is None:
+            mapper = inspect(model)
+            if mapper.single:  # the table is shared with other models, so the count needs their discriminator
+                return self._get_query(model).count()
+            statement = _COUNT_STATEMENTS[model] = func.count().select().select_from(mapper.local_table)
+        return self.session.execute(statement).scalar()
+
+    def _count_models(self, models: Iterable) -> Mapping[DeclarativeMeta, int]:
+        """Count the number of each of the given models in the database with a single query.
+
+        :param models: SQLAlchemy model classes
+        :return: A dictionary from each model to its count
+        """
+        models = list(models)
+        queries = [
+            self.session.query(
+                literal(position).label('position'),
+                func.count().label('count'),
+            ).select_from(model)
+            for position, model in enumerate(models)
+        ]
+        if not queries:
+            return {}
+        return {
+            models[position]: count
+            for position, count in queries[0].union_all(*queries[1:]).all()
+        }
 
     def _list_model(self, model) -> List:
         """Get all instances of the given model in the database.
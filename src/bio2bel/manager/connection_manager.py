@@ -3,10 +3,15 @@
 """Provides abstractions over the management of SQLAlchemy connections and sessions."""
 
 import logging
-from typing import Optional
+import sqlite3
+import weakref
+from typing import Any, Dict, Optional, Tuple
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
 from sqlalchemy.orm import scoped_session, sessionmaker
+from sqlalchemy.pool import StaticPool
 
 from ..exc import Bio2BELMissingNameError, Bio2BELModuleCaseError
 from ..models import Action, create_all
@@ -18,6 +23,16 @@ __all__ = [
 
 logger = logging.getLogger(__name__)
 
+#: Engines that have already been built, keyed by their connection string and options. Entries are dropped
+#: automatically once no manager (or session maker) refers to the engine anymore.
+_ENGINE_CACHE: 'weakref.WeakValueDictionary[Tuple, Engine]' = weakref.WeakValueDictionary()
+
+#: Session makers that have already been built, keyed by the identifier of their engine and the session options
+_SESSION_MAKER_CACHE: 'weakref.WeakValueDictionary[Tuple, sessionmaker]' = weakref.WeakValueDictionary()
+
+#: The number of open managers using each engine built by :func:`build_engine_session`
+_ENGINE_USERS: 'weakref.WeakKeyDictionary[Engine, int]' = weakref.WeakKeyDictionary()
+
 
 class ConnectionManager:
     """Represents the connection-building aspect of the abstract manager.
@@ -32,11 +47,33 @@ class ConnectionManager:
 
     In general, this class won't be used directly except in the situation where the connection should be loaded
     in a different way and it can be used as a mixin.
+
+    Managers can be used as context managers, which returns the session's connection to the pool on exit.
+
+    >>> with Manager() as manager:
+    >>>     manager.session.query(...)
+
+    The engine's connection pool can be tuned by overriding the class variables ``pool_size``, ``max_overflow``,
+    and ``pool_recycle``, which are passed to :func:`build_engine_session`. They only apply to databases that use
+    a :class:`sqlalchemy.pool.QueuePool`, so they are ignored for SQLite.
+
+    >>> class Manager(ConnectionManager):
+    >>>     module_name = 'interpro'
+    >>>     pool_size = 20
     """
 
     #: This represents the module name. Needs to be lower case
     module_name: str
 
+    #: The number of connections to keep open in the pool
+    pool_size: int = 10
+
+    #: The number of connections that can be opened beyond ``pool_size``. Set to -1 for no limit.
+    max_overflow: int = 20
+
+    #: The number of seconds after which a pooled connection is recycled
+    pool_recycle: int = 3600
+
     def __init__(self, connection: Optional[str] = None, engine=None, session=None, **kwargs):
         """Build an abstract manager from either a connection or an engine/session.
 
@@ -55,7 +92,14 @@ class ConnectionManager:
             if connection is None:
                 connection = self._get_connection()
 
+            kwargs.setdefault('pool_size', self.pool_size)
+            kwargs.setdefault('max_overflow', self.max_overflow)
+            kwargs.setdefault('pool_recycle', self.pool_recycle)
             engine, session = build_engine_session(connection=connection, **kwargs)
+            _ENGINE_USERS[engine] = _ENGINE_USERS.get(engine, 0) + 1
+            self._owns_engine = True
+        else:
+            self._owns_engine = False
 
         self.engine = engine
         self.session = session
@@ -67,14 +111,41 @@ class ConnectionManager:
         """Return this manager's connection string."""
         return str(self.engine.url)
 
+    def close(self) -> None:
+        """Remove this manager's session and dispose of its engine if no other open manager uses it.
+
+        Engines that were passed explicitly to the manager are never disposed.
+        """
+        self.session.remove()
+
+        if self._owns_engine:
+            self._owns_engine = False
+            _ENGINE_USERS[self.engine] -= 1
+            if not _ENGINE_USERS[self.engine]:
+                self.engine.dispose()
+
+    def __enter__(self):  # noqa: D105
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):  # noqa: D105
+        self.session.remove()
+
+    def __init_subclass__(cls, **kwargs):
+        """Check the subclass's module name, if it sets one, when the subclass is defined."""
+        super().__init_subclass__(**kwargs)
+
+        if 'module_name' not in cls.__dict__:
+            return
+        module_name = cls.__dict__['module_name']
+        if not isinstance(module_name, str):
+            raise TypeError(f'module_name class variable not set as str: {cls.__name__}')
+        if module_name != module_name.lower():
+            raise Bio2BELModuleCaseError('module_name class variable should be lowercase')
+
     @classmethod
     def _assert_module_name(cls):
         if not hasattr(cls, 'module_name'):
             raise Bio2BELMissingNameError(f'module_name class variable not set on {cls.__name__}')
-        elif not isinstance(cls.module_name, str):
-            raise TypeError(f'module_name class variable not set as str: {cls.__name__}')
-        elif cls.module_name != cls.module_name.lower():
-            raise Bio2BELModuleCaseError('module_name class variable should be lowercase')
 
     @classmethod
     def _get_connection(cls, connection: Optional[str] = None) -> str:
@@ -84,6 +155,16 @@ class ConnectionManager:
         """
         return get_connection(connection=connection)
 
+    @staticmethod
+    def clear_engine_cache() -> None:
+        """Forget all engines and session makers built by :func:`build_engine_session`.
+
+        Managers built afterwards get new engines, even if they use the same connection string as an
+        existing manager. This is mostly useful for isolating tests from each other.
+        """
+        _ENGINE_CACHE.clear()
+        _SESSION_MAKER_CACHE.clear()
+
     def _store_populate(self):
         Action.store_populate(self.module_name, session=self.session)
 
@@ -104,15 +185,31 @@ def build_engine_session(
     autocommit: Optional[bool] = None,
     expire_on_commit: Optional[bool] = None,
     scopefunc=None,
+    pool_size: int = 10,
+    max_overflow: int = 20,
+    pool_recycle: int = 3600,
+    pool_timeout: int = 30,
 ):
     """Build an engine and a session.
 
+    File-based SQLite databases are switched to write-ahead logging with ``synchronous=NORMAL``, so writes
+    (like storing actions) don't each wait for the disk to sync.
+
+    Engines and sessions are reused between calls with the same connection string and options, so building
+    several managers for the same database shares a single connection pool. Each call still gets its own
+    scoped session, so committing, rolling back, or removing one manager's session doesn't affect another's.
+    In-memory SQLite databases are the exception, since each engine for them is a separate database.
+
     :param connection: An RFC-1738 database connection string
     :param echo: Turn on echoing SQL
     :param autoflush: Defaults to True if not specified in kwargs or configuration.
     :param autocommit: Defaults to False if not specified in kwargs or configuration.
     :param expire_on_commit: Defaults to False if not specified in kwargs or configuration.
     :param scopefunc: Scoped function to pass to :func:`sqlalchemy.orm.scoped_session`
+    :param pool_size: The number of connections to keep open in the pool. Not used for SQLite.
+    :param max_overflow: The number of connections allowed beyond ``pool_size``. Not used for SQLite.
+    :param pool_recycle: The number of seconds after which a connection is recycled. Not used for SQLite.
+    :param pool_timeout: The number of seconds to wait for a connection from the pool. Not used for SQLite.
     :rtype: tuple[Engine,Session]
 
     From the Flask-SQLAlchemy documentation:
@@ -123,7 +220,13 @@ def build_engine_session(
     created and removed with the request/response cycle, and should be fine
     in most cases.
     """
-    engine = create_engine(connection, echo=echo)
+    pool_kwargs = _get_pool_kwargs(
+        connection,
+        pool_size=pool_size,
+        max_overflow=max_overflow,
+        pool_recycle=pool_recycle,
+        pool_timeout=pool_timeout,
+    )
 
     autoflush = autoflush if autoflush is not None else False
     autocommit = autocommit if autocommit is not None else False
@@ -131,13 +234,28 @@ def build_engine_session(
 
     logger.debug('auto flush: %s, auto commit: %s, expire on commmit: %s', autoflush, autocommit, expire_on_commit)
 
+    if pool_kwargs.get('poolclass') is StaticPool:  # each in-memory SQLite engine is its own database
+        engine = create_engine(connection, echo=echo, **pool_kwargs)
+    else:
+        engine_key = (connection, echo, tuple(sorted(pool_kwargs.items())))
+        engine = _ENGINE_CACHE.get(engine_key)
+        if engine is None:
+            engine = _ENGINE_CACHE[engine_key] = create_engine(connection, echo=echo, **pool_kwargs)
+            if engine.url.get_backend_name() == 'sqlite':
+                event.listen(engine, 'connect', _set_sqlite_pragmas)
+
+    # The session maker holds a reference to its engine, so the engine's id can't be reused while it is cached
+    session_maker_key = (id(engine), autoflush, autocommit, expire_on_commit)
+
     #: A SQLAlchemy session maker
-    session_maker = sessionmaker(
-        bind=engine,
-        autoflush=autoflush,
-        autocommit=autocommit,
-        expire_on_commit=expire_on_commit,
-    )
+    session_maker = _SESSION_MAKER_CACHE.get(session_maker_key)
+    if session_maker is None:
+        session_maker = _SESSION_MAKER_CACHE[session_maker_key] = sessionmaker(
+            bind=engine,
+            autoflush=autoflush,
+            autocommit=autocommit,
+            expire_on_commit=expire_on_commit,
+        )
 
     #: A SQLAlchemy session object
     session = scoped_session(
@@ -146,3 +264,47 @@ def build_engine_session(
     )
 
     return engine, session
+
+
+def _get_pool_kwargs(
+    connection: str,
+    pool_size: int,
+    max_overflow: int,
+    pool_recycle: int,
+    pool_timeout: int,
+) -> Dict[str, Any]:
+    """Get the keyword arguments for configuring the connection pool in :func:`sqlalchemy.create_engine`.
+
+    In-memory SQLite databases share a single connection across threads (so a Flask app sees the same
+    data as the manager that populated it) and file-based SQLite databases keep the dialect's default pool.
+    """
+    url = make_url(connection)
+    if url.get_backend_name() == 'sqlite':
+        if url.database in {None, '', ':memory:'}:
+            return {'poolclass': StaticPool, 'connect_args': {'check_same_thread': False}}
+        return {}
+
+    return {
+        'pool_size': pool_size,
+        'max_overflow': max_overflow,
+        'pool_recycle': pool_recycle,
+        'pool_timeout': pool_timeout,
+        'pool_pre_ping': True,
+    }
+
+
+def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+    """Configure a new connection to a file-based SQLite database for faster writes.
+
+    Switching to write-ahead logging needs write access, so read-only databases keep their journal mode.
+    """
+    cursor = dbapi_connection.cursor()
+    try:
+        cursor.execute('PRAGMA journal_mode=WAL')
+    except sqlite3.OperationalError as e:
+        logger.warning('could not use write-ahead logging for SQLite database: %s', e)
+    cursor.execute('PRAGMA synchronous=NORMAL')
+    cursor.execute('PRAGMA temp_store=MEMORY')
+    cursor.execute('PRAGMA mmap_size=268435456')  # 256 MiB
+    cursor.execute('PRAGMA cache_size=-65536')  # 64 MiB
+    cursor.close()
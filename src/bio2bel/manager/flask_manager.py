@@ -17,6 +17,22 @@ __all__ = [
     'FlaskMixin',
 ]
 
+#: The Flask and Flask-Admin classes. They're imported on first use so the rest of the CLI doesn't load them.
+_Flask = _Admin = _ModelView = None
+
+
+def _import_flask() -> None:
+    """Import the Flask and Flask-Admin classes if they haven't been imported yet."""
+    global _Flask, _Admin, _ModelView
+    if _ModelView is not None:
+        return
+
+    # the globals are only set once all imports succeed, so a failed import is tried again on the next call
+    from flask import Flask
+    from flask_admin import Admin
+    from flask_admin.contrib.sqla import ModelView
+    _Flask, _Admin, _ModelView = Flask, Admin, ModelView
+
 
 class FlaskMixin(ConnectionManager, CliMixin):
     """A mixin for building a Flask-Admin interface.
@@ -66,6 +82,9 @@ class FlaskMixin(ConnectionManager, CliMixin):
     #: Represents a list of SQLAlchemy classes to make a Flask-Admin interface.
     flask_admin_models: Union[DeclarativeMeta, List[DeclarativeMeta]]
 
+    #: Don't limit overflow connections, since browsing the admin interface can open many at once
+    max_overflow: int = -1
+
     def __init__(self, *args, **kwargs):  # noqa: D107
         if not hasattr(self, 'flask_admin_models') or not self.flask_admin_models:
             raise Bio2BELMissingModelsError('FlaskMixin requires the class variable "flask_admin_models".')
@@ -79,10 +98,9 @@ class FlaskMixin(ConnectionManager, CliMixin):
         :param kwargs: Keyword arguments are passed through to :class:`flask_admin.Admin`
         :rtype: flask_admin.Admin
         """
-        from flask_admin import Admin
-        from flask_admin.contrib.sqla import ModelView
+        _import_flask()
 
-        admin = Admin(app, **kwargs)
+        admin = _Admin(app, **kwargs)
 
         for flask_admin_model in self.flask_admin_models:
             if isinstance(flask_admin_model, tuple):  # assume its a 2 tuple
@@ -93,7 +111,7 @@ class FlaskMixin(ConnectionManager, CliMixin):
                 admin.add_view(view(model, self.session))
 
             else:
-                admin.add_view(ModelView(flask_admin_model, self.session))
+                admin.add_view(_ModelView(flask_admin_model, self.session))
 
         return admin
 
@@ -103,9 +121,9 @@ class FlaskMixin(ConnectionManager, CliMixin):
         :param url: Optional mount point of the admin application. Defaults to ``'/'``.
         :rtype: flask.Flask
         """
-        from flask import Flask
+        _import_flask()
 
-        app = Flask(__name__)
+        app = _Flask(__name__)
 
         if secret_key:
             app.secret_key = secret_key
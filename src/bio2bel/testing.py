@@ -28,6 +28,14 @@ __all__ = [
 log = logging.getLogger(__name__)
 
 
+def _remove_database(path: str) -> None:
+    """Remove a SQLite database and the files for its write-ahead log, if it has them."""
+    os.remove(path)
+    for suffix in ('-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
 class TemporaryConnectionMethodMixin(unittest.TestCase):
     """Creates a :class:`unittest.TestCase` that has a persistent file for use with SQLite during testing."""
 
@@ -42,7 +50,7 @@ class TemporaryConnectionMethodMixin(unittest.TestCase):
     def tearDown(self):
         """Close the connection to the database and removes the files created for it."""
         os.close(self.fd)
-        os.remove(self.path)
+        _remove_database(self.path)
 
 
 class TemporaryConnectionMixin(unittest.TestCase):
@@ -68,7 +76,7 @@ class TemporaryConnectionMixin(unittest.TestCase):
     def tearDownClass(cls):
         """Close the connection to the database and removes the files created for it."""
         os.close(cls.fd)
-        os.remove(cls.path)
+        _remove_database(cls.path)
 
 
 class MockConnectionMixin(TemporaryConnectionMixin):
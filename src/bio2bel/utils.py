@@ -2,23 +2,27 @@
 
 """Utilities for Bio2BEL."""
 
+from __future__ import annotations
+
 import hashlib
 import logging
 import os
 import pathlib
 import shutil
 import types
-from typing import Iterable, Mapping, Optional, Tuple
+from functools import lru_cache
+from typing import Iterable, Mapping, Optional, TYPE_CHECKING, Tuple
 from urllib.request import urlretrieve
 
 import requests
-from botocore.client import BaseClient
 from pkg_resources import UnknownExtra, VersionConflict, iter_entry_points
 from pystow.utils import name_from_url
 
-import pybel.config
 from .constants import BIO2BEL_MODULE
 
+if TYPE_CHECKING:
+    from botocore.client import BaseClient
+
 __all__ = [
     'get_data_dir',
     'prefix_directory_join',
@@ -31,9 +35,13 @@ __all__ = [
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=128)
 def get_data_dir(module_name: str) -> str:
     """Ensure the appropriate Bio2BEL data directory exists for the given module, then returns the file path.
 
+    The result is cached so the directory is only checked/created the first time each module is looked up.
+    Use ``get_data_dir.cache_clear()`` to check again.
+
     :param module_name: The name of the module. Ex: 'chembl'
     :return: The module's data directory
     """
@@ -123,19 +131,21 @@ def get_connection(connection: Optional[str] = None) -> str:
     Order of operations:
 
     1. Return the connection if given as a parameter
-    2. Check the environment for BIO2BEL_{module_name}_CONNECTION
-    3. Look in the bio2bel config file for module-specific connection. Create if doesn't exist. Check the
-       module-specific section for ``connection``
-    4. Look in the bio2bel module folder for a config file. Don't create if doesn't exist. Check the default section
-       for ``connection``
-    5. Check the environment for BIO2BEL_CONNECTION
-    6. Check the bio2bel config file for default
-    7. Fall back to standard default cache connection
+    2. Fall back to :data:`pybel.config.connection`
+
+    The PyBEL connection is looked up by :func:`pystow.get_config` once, when :mod:`pybel.config` is
+    first imported (checking the ``PYBEL_CONNECTION`` environment variable, then the PyBEL configuration
+    files, then the default cache connection). The first call without a connection may therefore read the
+    configuration files, but later calls don't touch the file system.
 
     :param connection: get the SQLAlchemy connection string
     :return: The SQLAlchemy connection string based on the configuration
     """
-    return connection or pybel.config.connection
+    if connection:
+        return connection
+
+    import pybel.config  # importing PyBEL is slow, so wait until the default connection is actually needed
+    return pybel.config.connection
 
 
 def get_bio2bel_modules() -> Mapping[str, types.ModuleType]:
@@ -165,6 +175,9 @@ def _get_modules(group) -> Iterable[Tuple[str, types.ModuleType]]:
         except ImportError as exc:
             logger.exception('Issue with importing module %s: %s', entry, exc)
             continue
+        except TypeError as exc:  # e.g., a manager with an invalid module_name, checked when its class is defined
+            logger.exception('Issue with defining the manager in module %s: %s', entry, exc)
+            continue
 
 
 def clear_cache(module_name: str, keep_database: bool = True) -> None:
@@ -175,8 +188,8 @@ def clear_cache(module_name: str, keep_database: bool = True) -> None:
     for name in os.listdir(data_dir):
         if name in {'config.ini', 'cfg.ini'}:
             continue
-        if name == 'cache.db' and keep_database:
-            continue
+        if name in {'cache.db', 'cache.db-wal', 'cache.db-shm'} and keep_database:
+            continue  # the write-ahead log can have committed transactions that aren't in the database file yet
         path = os.path.join(data_dir, name)
         if os.path.isdir(path):
             shutil.rmtree(path)
@@ -184,6 +197,7 @@ def clear_cache(module_name: str, keep_database: bool = True) -> None:
             os.remove(path)
 
     os.rmdir(data_dir)
+    get_data_dir.cache_clear()
 
 
 def get_namespace_hash(items, hash_function=None) -> str:
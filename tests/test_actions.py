@@ -49,3 +49,27 @@ class TestActions(TemporaryConnectionMethodMixin, MockConnectionMixin):
             action = actions[0]
             self.assertEqual(manager.module_name, action.resource)
             self.assertEqual('populate', action.action)
+
+    def test_action_subclass(self):
+        """Test a subclass of a manager that doesn't override populate only stores one action."""
+        class SubManager(Manager):
+            """A manager that inherits its populate function."""
+
+        manager = SubManager(connection=self.connection)
+        manager.populate()
+        self.assertEqual(1, Action.count(session=manager.session))
+
+    def test_action_mixin(self):
+        """Test a manager that gets its populate function from a mixin stores one action."""
+        class PopulateMixin:
+            """A mixin that provides a populate function."""
+
+            def populate(self):
+                """Populate the database."""
+
+        class MixinManager(PopulateMixin, Manager):
+            """A manager that gets its populate function from a mixin."""
+
+        manager = MixinManager(connection=self.connection)
+        manager.populate()
+        self.assertEqual(1, Action.count(session=manager.session))
@@ -0,0 +1,228 @@
+# -*- coding: utf-8 -*-
+
+"""Tests for the Bio2BEL downloading utilities."""
+
+import gzip
+import json
+import os
+import pathlib
+import re
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from bio2bel.downloading import make_batch_downloader, make_downloader
+
+DATA = bytes(range(256)) * 400
+ETAG = '"v1"'
+
+
+class RangeRequestHandler(BaseHTTPRequestHandler):
+    """Serves :data:`DATA` at every path and supports single range requests and conditional requests."""
+
+    def log_message(self, *args):  # noqa: D102
+        pass
+
+    def do_HEAD(self):  # noqa: D102,N802
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(DATA)))
+        self.send_header('Accept-Ranges', 'bytes')
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+
+    def do_GET(self):  # noqa: D102,N802
+        self.server.requests.append(self.headers.get('Range'))
+        if self.server.stall:
+            time.sleep(self.server.stall)
+        if self.headers.get('If-None-Match') == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+
+        match = re.fullmatch(r'bytes=(\d+)-(\d+)', self.headers.get('Range', ''))
+        if self.server.gzip:
+            self.send_response(200)
+            self.send_header('Content-Encoding', 'gzip')
+            body = gzip.compress(DATA)
+        elif match is None or self.server.ignore_ranges:
+            self.send_response(200)
+            body = DATA
+        else:
+            start, end = int(match.group(1)), int(match.group(2))
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {start}-{end}/{len(DATA)}')
+            body = DATA[start:end + 1]
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', ETAG)
+        self.end_headers()
+        self.wfile.write(body[:self.server.truncate])
+
+
+class TestDownloader(unittest.TestCase):
+    """Tests :func:`bio2bel.downloading.make_downloader`."""
+
+    def setUp(self):
+        """Start a local HTTP server and make a temporary directory to download to."""
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), RangeRequestHandler)
+        self.server.requests = []
+        self.server.stall = 0
+        self.server.truncate = None
+        self.server.gzip = False
+        self.server.ignore_ranges = False
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.url = f'http://127.0.0.1:{self.server.server_port}/data.bin'
+
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'data.bin')
+
+    def tearDown(self):
+        """Stop the server and remove the temporary directory."""
+        self.server.shutdown()
+        self.server.server_close()
+        self.directory.cleanup()
+
+    def _read(self) -> bytes:
+        with open(self.path, 'rb') as file:
+            return file.read()
+
+    def test_download(self):
+        """Test a small file is downloaded in one request."""
+        download = make_downloader(self.url, self.path)
+        self.assertEqual(self.path, download())
+        self.assertEqual(DATA, self._read())
+        self.assertEqual([None], self.server.requests)
+        self.assertEqual({'data.bin', 'data.bin.etag'}, set(os.listdir(self.directory.name)))
+
+    def test_not_modified(self):
+        """Test a cached file is checked with a conditional request and kept if it wasn't modified."""
+        download = make_downloader(self.url, self.path)
+        download()
+        with open(self.path, 'wb') as file:
+            file.write(b'cached')
+
+        download()
+        self.assertEqual(2, len(self.server.requests))
+        self.assertEqual(b'cached', self._read())
+
+        download(force_download=True)
+        self.assertEqual(3, len(self.server.requests))
+        self.assertEqual(DATA, self._read())
+
+    def test_revalidation_failure(self):
+        """Test a cached file is used if checking whether it was modified fails, or the server stalls."""
+        download = make_downloader(self.url, self.path)
+        download()
+        with open(self.path, 'wb') as file:
+            file.write(b'cached')
+        with open(self.path + '.etag', 'w') as file:
+            json.dump({'ETag': '"v0"'}, file)
+
+        self.server.truncate = 10
+        download()
+        self.assertEqual(b'cached', self._read())
+
+        self.server.truncate = None
+        self.server.stall = 1
+        with mock.patch('bio2bel.downloading.TIMEOUT', (1, 0.1)):
+            download()
+        self.assertEqual(b'cached', self._read())
+
+    def test_invalid_validators(self):
+        """Test a cached file is used without a request if its stored validators can't be read."""
+        download = make_downloader(self.url, self.path)
+        download()
+        with open(self.path, 'wb') as file:
+            file.write(b'cached')
+        with open(self.path + '.etag', 'w') as file:
+            file.write('{"ETag": ')
+
+        with self.assertLogs('bio2bel.downloading', 'WARNING'):
+            download()
+        self.assertEqual(1, len(self.server.requests))
+        self.assertEqual(b'cached', self._read())
+
+        download(force_download=True)
+        self.assertEqual(DATA, self._read())
+        with open(self.path + '.etag') as file:
+            self.assertEqual({'ETag': ETAG}, json.load(file))
+        self.assertEqual({'data.bin', 'data.bin.etag'}, set(os.listdir(self.directory.name)))
+
+    def test_content_encoding(self):
+        """Test gzip-encoded responses are decompressed, unless they're saved as a compressed file."""
+        self.server.gzip = True
+        make_downloader(self.url, self.path)()
+        self.assertEqual(DATA, self._read())
+
+        gz_path = self.path + '.gz'
+        make_downloader(self.url, gz_path)()
+        with open(gz_path, 'rb') as file:
+            self.assertEqual(DATA, gzip.decompress(file.read()))
+
+    def test_no_validators(self):
+        """Test a cached file without stored validators is used without a request."""
+        with open(self.path, 'wb') as file:
+            file.write(b'cached')
+
+        make_downloader(self.url, self.path)()
+        self.assertEqual([], self.server.requests)
+        self.assertEqual(b'cached', self._read())
+
+    def test_local(self):
+        """Test a local file is copied, given either as a path or a file URL."""
+        source = os.path.join(self.directory.name, 'source.bin')
+        with open(source, 'wb') as file:
+            file.write(DATA)
+
+        for url in (source, pathlib.Path(source).as_uri()):
+            with self.subTest(url=url):
+                make_downloader(url, self.path)(force_download=True)
+                self.assertEqual(DATA, self._read())
+
+    def test_permissions(self):
+        """Test downloaded and copied files get the default permissions for new files."""
+        umask = os.umask(0)
+        os.umask(umask)
+        source = os.path.join(self.directory.name, 'source.bin')
+        with open(source, 'wb') as file:
+            file.write(DATA)
+
+        for url in (self.url, source):
+            with self.subTest(url=url):
+                make_downloader(url, self.path)(force_download=True)
+                self.assertEqual(0o666 & ~umask, os.stat(self.path).st_mode & 0o777)
+
+    def test_batch(self):
+        """Test several files are downloaded at once, skipping ones that are cached."""
+        with open(self.path, 'wb') as file:
+            file.write(b'cached')
+
+        paths = [self.path] + [os.path.join(self.directory.name, f'data_{i}.bin') for i in range(3)]
+        download_all = make_batch_downloader([(self.url, path) for path in paths], max_concurrency=2)
+        self.assertEqual(paths, download_all())
+        self.assertEqual(3, len(self.server.requests))
+        self.assertEqual(b'cached', self._read())
+        for path in paths[1:]:
+            with open(path, 'rb') as file:
+                self.assertEqual(DATA, file.read())
+
+    def test_download_ranges(self):
+        """Test a large file is downloaded in several ranges."""
+        download = make_downloader(self.url, self.path)
+        with mock.patch('bio2bel.downloading.PARALLEL_DOWNLOAD_THRESHOLD', 1000):
+            download()
+        self.assertEqual(DATA, self._read())
+        self.assertEqual(8, len(self.server.requests))
+        self.assertTrue(all(self.server.requests))
+
+    def test_download_ranges_ignored(self):
+        """Test a large file is downloaded in one request if the server ignores range requests."""
+        self.server.ignore_ranges = True
+        download = make_downloader(self.url, self.path)
+        with mock.patch('bio2bel.downloading.PARALLEL_DOWNLOAD_THRESHOLD', 1000):
+            download()
+        self.assertEqual(DATA, self._read())
+        self.assertIsNone(self.server.requests[-1])
@@ -2,9 +2,13 @@
 
 """Tests the Flask web application generation utilities."""
 
+import sys
+from unittest import mock
+
 from flask_admin.contrib.sqla import ModelView
 
 from bio2bel.exc import Bio2BELMissingModelsError
+from bio2bel.manager import flask_manager
 from bio2bel.manager.flask_manager import FlaskMixin
 from bio2bel.testing import TemporaryConnectionMethodMixin
 from tests.constants import Manager, Model
@@ -94,3 +98,15 @@ class TestFlask(TemporaryConnectionMethodMixin):
 
         with self.assertRaises(TypeError):
             manager.get_flask_admin_app()
+
+    def test_import_failure(self):
+        """Test a failed import of Flask-Admin is tried again instead of leaving the classes partially imported."""
+        with mock.patch.multiple(flask_manager, _Flask=None, _Admin=None, _ModelView=None):
+            with mock.patch.dict(sys.modules, {'flask_admin': None}):
+                for _ in range(2):
+                    with self.assertRaises(ImportError):
+                        flask_manager._import_flask()
+                    self.assertIsNone(flask_manager._Flask)
+
+            flask_manager._import_flask()
+            self.assertIs(ModelView, flask_manager._ModelView)